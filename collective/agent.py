@@ -1,28 +1,41 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Callable, Set
+from typing import Any, Dict, Callable, Optional, Sequence, Set, Tuple
+import copy
+import json
 
 from .environment import Environment
 
 
-@dataclass
+@dataclass(eq=False)
 class Agent:
     """
     A specialized agent that acts when conditions are met.
 
     Args:
         name: Unique identifier
-        consumes: List of trace types this agent needs to activate
+        consumes: Trace types this agent needs to activate (stored as a tuple)
         produces: Trace type this agent produces
-        execute: Async function (Dict) -> Dict
+        execute: Async function (Dict) -> Dict, stored as trace data as-is
         run_once: If True, agent only fires once per task
+        pure: If True, execute is deterministic in its context, so results
+            may be reused for identical contexts within a run. Only contexts
+            that are JSON-serializable and results that can be deep-copied
+            are memoized; anything else simply runs execute again
+        wrap_result: If True, non-dict results are stored as {"result": ...}
     """
 
     name: str
-    consumes: List[str]
+    consumes: Sequence[str]
     produces: str
     execute: Callable[[Dict[str, Any]], Any]
     run_once: bool = False
+    pure: bool = False
+    wrap_result: bool = False
     _has_run: Set[str] = field(default_factory=set)
+    _cache: Dict[str, Tuple[int, bool]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.consumes = tuple(self.consumes)
 
     def can_activate(self, env: Environment, task: str) -> bool:
         """
@@ -36,31 +49,59 @@ class Agent:
         if self.run_once and task in self._has_run:
             return False
 
+        version = env.version(task)
+        cached = self._cache.get(task)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        ready = self._check_traces(env, task)
+        self._cache[task] = (version, ready)
+        return ready
+
+    def _check_traces(self, env: Environment, task: str) -> bool:
+        """Check inputs are present and no alive output exists."""
         for trace_type in self.consumes:
-            if not env.read(task, trace_type):
+            if not env.has_alive(task, trace_type):
                 return False
 
-        existing = env.strongest(task, self.produces)
-        return existing is None or existing.invalidated
+        return not env.has_alive(task, self.produces)
 
     def build_context(self, env: Environment, task: str) -> Dict[str, Any]:
         """Build context dict from consumed traces."""
-        context = {}
-        for trace_type in self.consumes:
-            traces = env.read(task, trace_type)
-            if traces:
-                strongest = max(traces, key=lambda t: t.strength)
-                context[trace_type] = strongest.data
-        return context
-
-    async def act(self, env: Environment, task: str) -> Dict[str, Any]:
-        """Execute agent's function and leave trace."""
+        return {
+            trace_type: strongest.data
+            for trace_type in self.consumes
+            if (strongest := env.strongest(task, trace_type))
+        }
+
+    async def act(
+        self,
+        env: Environment,
+        task: str,
+        memo: Optional[Dict[Tuple[str, str], Any]] = None,
+    ) -> Any:
+        """
+        Execute agent's function and leave trace.
+        Pure agents reuse results from memo for an identical context.
+        The memo holds private copies, so callers may mutate the result.
+        """
+        self._cache.pop(task, None)
         context = self.build_context(env, task)
 
-        result = await self.execute(context)
+        key = self._memo_key(context) if self.pure else None
+        if memo is None or key is None:
+            result = await self.execute(context)
+        elif key in memo:
+            result = copy.deepcopy(memo[key])
+        else:
+            result = await self.execute(context)
+            try:
+                memo[key] = copy.deepcopy(result)
+            except (TypeError, ValueError, copy.Error):
+                pass  # Memoization is best-effort
 
         # Normalize result to dict
-        if not isinstance(result, dict):
+        if self.wrap_result and not isinstance(result, dict):
             result = {"result": result}
 
         await env.add(agent=self.name, task=task, type=self.produces, data=result)
@@ -70,9 +111,21 @@ class Agent:
 
         return result
 
+    def _memo_key(self, context: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Memo key for a context, or None if it is not JSON-serializable."""
+        try:
+            return (self.name, json.dumps(context, sort_keys=True))
+        except (TypeError, ValueError):
+            return None
+
 
 def agent(
-    name: str, consumes: List[str], produces: str, run_once: bool = False
+    name: str,
+    consumes: Sequence[str],
+    produces: str,
+    run_once: bool = False,
+    pure: bool = False,
+    wrap_result: bool = False,
 ) -> Callable[[Callable], Agent]:
     """
     Decorator to create agents from async functions.
@@ -85,6 +138,14 @@ def agent(
         @agent("init", consumes=["goal"], produces="config", run_once=True)
         async def initialize(ctx):
             return {"config": "..."}
+
+        @agent("formatter", consumes=["code"], produces="formatted", pure=True)
+        async def format_code(ctx):
+            return {"formatted": "..."}
+
+        @agent("counter", consumes=["code"], produces="lines", wrap_result=True)
+        async def count_lines(ctx):
+            return 42  # stored as {"result": 42}
     """
 
     def decorator(fn: Callable[[Dict], Any]) -> Agent:
@@ -94,6 +155,8 @@ def agent(
             produces=produces,
             execute=fn,
             run_once=run_once,
+            pure=pure,
+            wrap_result=wrap_result,
         )
 
     return decorator
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List, Callable, Optional, Set
-from collections import defaultdict
+from typing import Any, Dict, List, Callable, Optional, Set, Tuple
+from collections import defaultdict, deque
 import asyncio
 
 from .agent import Agent
@@ -23,6 +23,11 @@ class Collective:
     """
     Self-organizing collective of agents.
 
+    Args:
+        decay_rates: Optional custom decay rate per trace type
+        max_cycle_history: Number of past states kept for cycle detection
+        max_concurrent: Maximum agents executing at once (None = unbounded)
+
     Usage:
         collective = Collective()
         collective.add(agent1, agent2)
@@ -33,15 +38,34 @@ class Collective:
         self,
         decay_rates: Optional[Dict[str, float]] = None,
         max_cycle_history: int = 10,
+        max_concurrent: Optional[int] = None,
     ):
         self.agents: List[Agent] = []
         self.env = Environment()
         self.decay_rates = decay_rates or {}
         self.max_cycle_history = max_cycle_history
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        self.max_concurrent = max_concurrent
+
+        # Static dependency graph: trace type -> agents reading/writing it
+        self._consumers: Dict[str, List[Agent]] = defaultdict(list)
+        self._producers: Dict[str, List[Agent]] = defaultdict(list)
+        self._rank: Dict[Agent, int] = {}
+        # Per task: agents whose activation may have changed since last round
+        self._ready: Dict[str, Set[Agent]] = {}
+        self.env.watch(self._on_trace)
 
     def add(self, *agents: Agent) -> "Collective":
         """Add agents to the collective. Chainable."""
-        self.agents.extend(agents)
+        for a in agents:
+            self._rank[a] = len(self.agents)
+            self.agents.append(a)
+            for trace_type in a.consumes:
+                self._consumers[trace_type].append(a)
+            self._producers[a.produces].append(a)
+            for ready in self._ready.values():
+                ready.add(a)
         return self
 
     async def run(
@@ -68,9 +92,21 @@ class Collective:
             RunResult with outcome and metadata
         """
         # Initialize
+        if task not in self._ready:
+            self._ready[task] = set(self.agents)
+        ready = self._ready[task]
+        # Results of pure agents for this run only, keyed by context
+        memo: Dict[Tuple[str, str], Any] = {}
+        # Created per run so the collective can be reused across event loops
+        sem = (
+            asyncio.Semaphore(self.max_concurrent)
+            if self.max_concurrent is not None
+            else None
+        )
         self.env.add_sync("user", task, goal_type, {"goal": goal})
 
-        state_history: List[str] = []
+        state_history: deque[str] = deque()
+        seen_states: Set[str] = set()
         errors: List[Dict[str, Any]] = []
         converged = False
         cycle_detected = False
@@ -80,16 +116,22 @@ class Collective:
         for round_num in range(max_rounds):
             # Cycle detection
             current_state = self.env.snapshot(task)
-            if stop_on_cycle and current_state in state_history:
+            if stop_on_cycle and current_state in seen_states:
                 cycle_detected = True
                 converged = True
                 break
             state_history.append(current_state)
+            seen_states.add(current_state)
             if len(state_history) > self.max_cycle_history:
-                state_history.pop(0)
+                seen_states.discard(state_history.popleft())
 
-            # Find activatable agents
-            active = [a for a in self.agents if a.can_activate(self.env, task)]
+            # Find activatable agents among those affected by recent traces
+            active = [
+                a
+                for a in sorted(ready, key=self._rank.__getitem__)
+                if a.can_activate(self.env, task)
+            ]
+            ready.intersection_update(active)
 
             if on_round:
                 on_round(round_num + 1, [a.name for a in active])
@@ -103,10 +145,7 @@ class Collective:
                 idle_rounds = 0
 
                 # Execute with individual error handling
-                results = await asyncio.gather(
-                    *[self._safe_execute(a, task) for a in active],
-                    return_exceptions=False,
-                )
+                results = await self._execute_round(active, task, memo, sem)
 
                 # Collect errors
                 for agent, result in zip(active, results):
@@ -131,10 +170,46 @@ class Collective:
             errors=errors,
         )
 
-    async def _safe_execute(self, agent: Agent, task: str) -> Any:
+    def _on_trace(self, task: str, type: str):
+        """Mark agents reading or writing a trace type for re-checking."""
+        ready = self._ready.get(task)
+        if ready is not None:
+            ready.update(self._consumers.get(type, ()))
+            ready.update(self._producers.get(type, ()))
+
+    async def _execute_round(
+        self,
+        active: List[Agent],
+        task: str,
+        memo: Dict[Tuple[str, str], Any],
+        sem: Optional[asyncio.Semaphore],
+    ) -> List[Any]:
+        """Execute active agents concurrently, returning results in order."""
+        async with asyncio.TaskGroup() as tg:
+            pending = [
+                tg.create_task(self._bounded(a, task, memo, sem)) for a in active
+            ]
+        return [p.result() for p in pending]
+
+    async def _bounded(
+        self,
+        agent: Agent,
+        task: str,
+        memo: Dict[Tuple[str, str], Any],
+        sem: Optional[asyncio.Semaphore],
+    ) -> Any:
+        """Execute agent, waiting for a free slot if concurrency is capped."""
+        if sem is None:
+            return await self._safe_execute(agent, task, memo)
+        async with sem:
+            return await self._safe_execute(agent, task, memo)
+
+    async def _safe_execute(
+        self, agent: Agent, task: str, memo: Dict[Tuple[str, str], Any]
+    ) -> Any:
         """Execute agent with error handling. Leaves error trace on failure."""
         try:
-            return await agent.act(self.env, task)
+            return await agent.act(self.env, task, memo)
         except Exception as e:
             await self.env.add(
                 agent=agent.name,
@@ -144,26 +219,14 @@ class Collective:
             )
             return e
 
-    def result(self, task: str, type: str) -> Optional[Dict[str, Any]]:
+    def result(self, task: str, type: str) -> Optional[Any]:
         """Extract final result of a specific type."""
         return self.env.strongest_data(task, type)
 
-    def results(self, task: str, *types: str) -> Dict[str, Optional[Dict[str, Any]]]:
+    def results(self, task: str, *types: str) -> Dict[str, Optional[Any]]:
         """Extract multiple result types at once."""
         return {t: self.result(task, t) for t in types}
 
     def _summarize_traces(self, task: str) -> Dict[str, Any]:
         """Summarize trace activity."""
-        all_traces = self.env.read(task)
-        by_type: Dict[str, int] = defaultdict(int)
-        agents_used: Set[str] = set()
-
-        for t in all_traces:
-            by_type[t.type] += 1
-            agents_used.add(t.agent)
-
-        return {
-            "types": dict(by_type),
-            "agents": list(agents_used),
-            "total": len(all_traces),
-        }
+        return self.env.summary(task)
@@ -1,10 +1,17 @@
-from typing import Any, Dict, List, Optional
-from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from itertools import chain, count
+from operator import attrgetter
 import asyncio
 import hashlib
+import heapq
 
 from .trace import Trace
 
+# Shared across environments so a version number identifies one state of one
+# task in one environment.
+_versions = count(1)
+
 
 class Environment:
     """
@@ -12,47 +19,90 @@ class Environment:
     """
 
     def __init__(self):
-        self._traces: Dict[str, List[Trace]] = defaultdict(list)
-        self._write_lock = asyncio.Lock()
+        # Traces are indexed by task, then by type, so per-type queries only
+        # touch the traces they are interested in. Only valid traces live
+        # here: invalidate() moves traces out and decay() prunes weak ones,
+        # so every stored trace is alive.
+        self._traces: Dict[str, Dict[str, List[Trace]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        # Invalidated traces, kept for observe() until the next decay
+        self._invalidated: Dict[str, List[Trace]] = defaultdict(list)
+        self._strongest_cache: Dict[Tuple[str, str], Optional[Trace]] = {}
+        self._version: Dict[str, int] = {}
+        # Alive trace counts per task, kept in step with every write
+        self._type_counts: Dict[str, Counter[str]] = defaultdict(Counter)
+        self._agent_counts: Dict[str, Counter[str]] = defaultdict(Counter)
+        self._watchers: List[Callable[[str, str], None]] = []
+        # One write lock per task, so different tasks never block each other
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
-    async def add(
-        self, agent: str, task: str, type: str, data: Dict[str, Any]
-    ) -> Trace:
+    async def add(self, agent: str, task: str, type: str, data: Any) -> Trace:
         """Agent leaves a trace. Returns the created trace."""
         trace = Trace(agent=agent, task=task, type=type, data=data)
-        async with self._write_lock:
-            self._traces[task].append(trace)
+        async with self._locks[task]:
+            self._insert(trace)
+        self._notify(task, type)
         return trace
 
-    def add_sync(self, agent: str, task: str, type: str, data: Dict[str, Any]) -> Trace:
+    def add_sync(self, agent: str, task: str, type: str, data: Any) -> Trace:
         """Synchronous version for initialization (not thread-safe)."""
         trace = Trace(agent=agent, task=task, type=type, data=data)
-        self._traces[task].append(trace)
+        self._insert(trace)
+        self._notify(task, type)
         return trace
 
+    def version(self, task: str) -> int:
+        """
+        Counter that changes whenever traces of a task appear or disappear.
+        Strength changes alone (decay without pruning, reinforce) keep it.
+        """
+        return self._version.get(task, 0)
+
+    def watch(self, callback: Callable[[str, str], None]):
+        """
+        Register callback(task, type), called whenever traces of a type
+        are added, invalidated or evaporate.
+        """
+        self._watchers.append(callback)
+
     def read(self, task: str, type: Optional[str] = None) -> List[Trace]:
-        """Read alive traces, optionally filtered by type."""
-        traces = [t for t in self._traces[task] if t.alive]
+        """
+        Read alive traces in time order, optionally filtered by type.
+        Each per-type list is already in creation order, so an unfiltered
+        read merges them instead of sorting.
+        """
         if type:
-            traces = [t for t in traces if t.type == type]
-        return sorted(traces, key=lambda t: t.time)
+            return list(self._traces[task].get(type, ()))
+        return list(
+            heapq.merge(*self._traces[task].values(), key=attrgetter("time_ns"))
+        )
+
+    def has_alive(self, task: str, type: str) -> bool:
+        """Check if at least one alive trace of a given type exists."""
+        return bool(self._traces[task].get(type))
 
     def strongest(self, task: str, type: str) -> Optional[Trace]:
         """Get the strongest alive trace of a given type."""
-        traces = self.read(task, type)
-        return max(traces, key=lambda t: t.strength) if traces else None
+        key = (task, type)
+        if key in self._strongest_cache:
+            return self._strongest_cache[key]
+        traces = self._traces[task].get(type, ())
+        strongest = max(traces, key=lambda t: t.strength, default=None)
+        self._strongest_cache[key] = strongest
+        return strongest
 
     def freshest(self, task: str, type: str) -> Optional[Trace]:
         """Get the most recent alive trace of a given type."""
-        traces = self.read(task, type)
-        return min(traces, key=lambda t: t.age) if traces else None
+        traces = self._traces[task].get(type)
+        return traces[-1] if traces else None
 
-    def strongest_data(self, task: str, type: str) -> Optional[Dict[str, Any]]:
+    def strongest_data(self, task: str, type: str) -> Optional[Any]:
         """Get data from the strongest alive trace, or None."""
         trace = self.strongest(task, type)
         return trace.data if trace else None
 
-    def freshest_data(self, task: str, type: str) -> Optional[Dict[str, Any]]:
+    def freshest_data(self, task: str, type: str) -> Optional[Any]:
         """Get data from the most recent alive trace, or None."""
         trace = self.freshest(task, type)
         return trace.data if trace else None
@@ -62,55 +112,120 @@ class Environment:
     ):
         """
         Mark traces as invalid, triggering re-computation.
-        Can filter by agent, type, or both.
+        Can filter by agent, type, or both. This is the only supported way
+        to invalidate traces.
         """
-        for trace in self._traces[task]:
-            if agent and trace.agent != agent:
-                continue
-            if type and trace.type != type:
-                continue
-            trace.invalidate()
+        by_type = self._traces[task]
+        invalidated = self._invalidated[task]
+        types = [type] if type else list(by_type)
+        for trace_type in types:
+            kept = []
+            for trace in by_type.get(trace_type, ()):
+                if agent and trace.agent != agent:
+                    kept.append(trace)
+                    continue
+                trace._invalidate()
+                self._count(trace, -1)
+                invalidated.append(trace)
+            if trace_type in by_type:
+                by_type[trace_type] = kept
+            self._drop_dead_strongest(task, trace_type)
+        self._bump(task)
+        for trace_type in types:
+            self._notify(task, trace_type)
 
     def reinforce(self, task: str, type: str, amount: float = 0.3):
         """Strengthen traces of a type (positive feedback)."""
-        for trace in self._traces[task]:
-            if trace.type == type and trace.alive:
-                trace.strength = min(1.0, trace.strength + amount)
+        for trace in self._traces[task].get(type, ()):
+            trace.strength = min(1.0, trace.strength + amount)
+        self._strongest_cache.pop((task, type), None)
 
     def decay(self, task: str, rates: Optional[Dict[str, float]] = None):
         """Evaporate pheromones (sync version). Can specify custom rates per type."""
         default_rate = 0.15
-        for trace in self._traces[task]:
-            rate = rates.get(trace.type, default_rate) if rates else default_rate
-            trace.decay(rate)
-        self._traces[task] = [t for t in self._traces[task] if t.alive]
+        by_type = self._traces[task]
+        evaporated = []
+        for trace_type, traces in by_type.items():
+            if not traces:
+                continue
+            rate = rates.get(trace_type, default_rate) if rates else default_rate
+            keep = 1 - rate
+            pruned = False
+            for trace in traces:
+                trace.strength *= keep
+                if not trace.alive:
+                    pruned = True
+            if pruned:
+                survivors = []
+                for trace in traces:
+                    if trace.alive:
+                        survivors.append(trace)
+                    else:
+                        self._count(trace, -1)
+                by_type[trace_type] = survivors
+                evaporated.append(trace_type)
+            # Decay is uniform within a type, so the strongest trace stays
+            # the strongest unless it evaporated.
+            self._drop_dead_strongest(task, trace_type)
+        self._invalidated.pop(task, None)
+        if evaporated:
+            self._bump(task)
+        for trace_type in evaporated:
+            self._notify(task, trace_type)
 
     async def decay_async(self, task: str, rates: Optional[Dict[str, float]] = None):
         """Evaporate pheromones (async/thread-safe version)."""
-        async with self._write_lock:
+        async with self._locks[task]:
             self.decay(task, rates)
 
     def snapshot(self, task: str) -> str:
         """Hash of current state for cycle detection."""
-        traces = self.read(task)
-        state = tuple((t.type, t.agent, round(t.strength, 1)) for t in traces)
-        return hashlib.md5(str(state).encode()).hexdigest()
+        buf = bytearray()
+        for trace_type, traces in self._traces[task].items():
+            prefix = trace_type.encode() + b"\x00"
+            for t in traces:
+                buf += prefix
+                buf += t.agent.encode()
+                buf += b"\x00"
+                buf.append(round(t.strength * 10))
+        return hashlib.blake2b(buf, digest_size=8).hexdigest()
 
     def has_errors(self, task: str) -> bool:
         """Check if any error traces exist for this task."""
-        return bool(self.read(task, "error"))
+        return self.has_alive(task, "error")
 
     def errors(self, task: str) -> List[Dict[str, Any]]:
         """Get all error trace data for this task."""
         return [t.data for t in self.read(task, "error")]
 
+    def summary(self, task: str) -> Dict[str, Any]:
+        """Counts of alive traces for a task, by type and by agent."""
+        types = +self._type_counts.get(task, Counter())
+        agents = +self._agent_counts.get(task, Counter())
+        return {
+            "types": dict(types),
+            "agents": list(agents),
+            "total": types.total(),
+        }
+
     def clear(self, task: str):
         """Remove all traces for a task."""
-        self._traces[task] = []
+        self._forget_strongest(task)
+        by_type = self._traces.pop(task, {})
+        self._invalidated.pop(task, None)
+        self._type_counts.pop(task, None)
+        self._agent_counts.pop(task, None)
+        self._locks.pop(task, None)
+        self._bump(task)
+        for trace_type in by_type:
+            self._notify(task, trace_type)
 
     def observe(self, task: str) -> str:
         """Debug view of all traces for a task, sorted by time."""
-        traces = sorted(self._traces[task], key=lambda t: t.time)
+        traces = sorted(
+            chain(*self._traces[task].values(), self._invalidated[task]),
+            key=lambda t: t.time_ns,
+        )
         if not traces:
             return "(no traces)"
 
@@ -122,3 +237,44 @@ class Environment:
                 f"(str={t.strength:.2f}, age={t.age:.1f}s)"
             )
         return "\n".join(lines)
+
+    def _forget_strongest(self, task: str):
+        """Drop cached strongest traces for every type of a task."""
+        for trace_type in self._traces[task]:
+            self._strongest_cache.pop((task, trace_type), None)
+
+    def _insert(self, trace: Trace):
+        """Store a new trace and update the indexes derived from it."""
+        self._traces[trace.task][trace.type].append(trace)
+        self._offer_strongest(trace)
+        self._count(trace, 1)
+        self._bump(trace.task)
+
+    def _count(self, trace: Trace, delta: int):
+        """Adjust alive trace counts for a trace entering or leaving."""
+        self._type_counts[trace.task][trace.type] += delta
+        self._agent_counts[trace.task][trace.agent] += delta
+
+    def _offer_strongest(self, trace: Trace):
+        """Update the cached strongest trace with a newly added one."""
+        key = (trace.task, trace.type)
+        if key not in self._strongest_cache:
+            return
+        cached = self._strongest_cache[key]
+        if cached is None or trace.strength > cached.strength:
+            self._strongest_cache[key] = trace
+
+    def _drop_dead_strongest(self, task: str, type: str):
+        """Forget the cached strongest trace if it is no longer alive."""
+        cached = self._strongest_cache.get((task, type))
+        if cached is not None and not cached.alive:
+            del self._strongest_cache[(task, type)]
+
+    def _bump(self, task: str):
+        """Record that the traces of a task changed."""
+        self._version[task] = next(_versions)
+
+    def _notify(self, task: str, type: str):
+        """Tell watchers that traces of a type changed."""
+        for callback in self._watchers:
+            callback(task, type)
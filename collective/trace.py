@@ -1,19 +1,25 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict
-from datetime import datetime
+from typing import Any
+import time
+import warnings
 
 
-@dataclass
+@dataclass(slots=True)
 class Trace:
     """
     A pheromone trail left by an agent.
+
+    Traces handed out by Environment are live objects indexed by the
+    environment. Change their strength or validity only through
+    Environment (invalidate, reinforce, decay); mutating a trace directly
+    leaves the environment's indexes out of date.
     """
 
     agent: str
     task: str
     type: str
-    data: Dict[str, Any]
-    time: datetime = field(default_factory=datetime.now)
+    data: Any
+    time_ns: int = field(default_factory=time.monotonic_ns)
     strength: float = 1.0
     invalidated: bool = False
 
@@ -23,13 +29,30 @@ class Trace:
         return self.strength > 0.05
 
     def invalidate(self):
-        """Mark trace as invalid, triggering re-computation."""
+        """
+        Deprecated: use Environment.invalidate, which also removes the trace
+        from the environment's indexes. Calling this only flags the trace, so
+        the environment keeps serving it.
+        """
+        warnings.warn(
+            "Trace.invalidate() does not update the environment; "
+            "use Environment.invalidate(task, agent=..., type=...) instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self._invalidate()
+
+    def _invalidate(self):
+        """
+        Mark trace as invalid. Use Environment.invalidate instead, which
+        also removes the trace from the environment's indexes.
+        """
         self.invalidated = True
 
     @property
     def age(self) -> float:
         """Seconds since trace was created."""
-        return (datetime.now() - self.time).total_seconds()
+        return (time.monotonic_ns() - self.time_ns) * 1e-9
 
     @property
     def alive(self) -> bool:
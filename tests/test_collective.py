@@ -1,3 +1,6 @@
+import asyncio
+import threading
+
 import pytest
 from collective import Collective, agent, Environment
 
@@ -68,6 +71,98 @@ class TestBasicPipeline:
         combined = collective.result("test_parallel", "combined")
         assert combined is not None
 
+    @pytest.mark.asyncio
+    async def test_fast_decaying_input_reaches_agent(self):
+        """Inputs seen by can_activate should still be there when agents run."""
+        fired = []
+
+        @agent("reader", consumes=["goal"], produces="output")
+        async def read_goal(ctx):
+            return {"goal": ctx["goal"]["goal"]}
+
+        collective = Collective(decay_rates={"goal": 0.99}).add(read_goal)
+        result = await collective.run(
+            task="test_fast_decay",
+            goal="Test",
+            on_round=lambda r, agents: fired.append(agents),
+        )
+
+        assert result.errors == []
+        assert fired[0] == ["reader"]
+        assert collective.result("test_fast_decay", "output") == {"goal": "Test"}
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent_limits_parallel_agents(self):
+        """No more than max_concurrent agents should execute at once."""
+        running = 0
+        peak = 0
+
+        def make(i):
+            @agent(f"worker_{i}", consumes=["goal"], produces=f"out_{i}")
+            async def work(ctx):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return {"i": i}
+
+            return work
+
+        collective = Collective(max_concurrent=2).add(*[make(i) for i in range(5)])
+        result = await collective.run(task="test_limit", goal="Test")
+
+        assert result.converged
+        assert peak == 2
+        assert len(result.traces["agents"]) == 6
+
+    @pytest.mark.asyncio
+    async def test_pure_agent_reuses_result_for_same_context(self):
+        """A pure agent re-firing on an unchanged context should not re-execute."""
+        calls = []
+        fired = []
+
+        @agent("generator", consumes=["goal"], produces="output", pure=True)
+        async def generate(ctx):
+            calls.append(ctx["goal"]["goal"])
+            return {"text": "done"}
+
+        collective = Collective(decay_rates={"output": 0.99}).add(generate)
+        await collective.run(
+            task="test_pure",
+            goal="Test",
+            max_rounds=4,
+            on_round=lambda r, agents: fired.extend(agents),
+        )
+
+        assert fired.count("generator") > 1
+        assert calls == ["Test"]
+
+    def test_max_concurrent_must_be_positive(self):
+        """max_concurrent below 1 should be rejected, not treated as unbounded."""
+        for value in (0, -1):
+            with pytest.raises(ValueError):
+                Collective(max_concurrent=value)
+
+    def test_capped_collective_reusable_across_event_loops(self):
+        """A collective with max_concurrent should run under separate loops."""
+
+        def make(i):
+            @agent(f"worker_{i}", consumes=["goal"], produces=f"out_{i}")
+            async def work(ctx):
+                await asyncio.sleep(0)
+                return {"goal": ctx["goal"]["goal"]}
+
+            return work
+
+        collective = Collective(max_concurrent=1).add(*[make(i) for i in range(3)])
+
+        first = asyncio.run(collective.run(task="loop_1", goal="One"))
+        second = asyncio.run(collective.run(task="loop_2", goal="Two"))
+
+        assert first.errors == [] and second.errors == []
+        assert collective.result("loop_2", "out_2") == {"goal": "Two"}
+
 
 class TestEnvironment:
     """Test environment trace operations."""
@@ -80,13 +175,41 @@ class TestEnvironment:
         env.add_sync("agent2", "task", "data", {"version": 2})
 
         # Manually set strengths
-        env._traces["task"][0].strength = 0.5
-        env._traces["task"][1].strength = 0.9
+        env._traces["task"]["data"][0].strength = 0.5
+        env._traces["task"]["data"][1].strength = 0.9
 
         strongest = env.strongest("task", "data")
         assert strongest is not None
         assert strongest.data["version"] == 2
 
+    def test_strongest_tracks_new_traces(self):
+        """strongest() should reflect traces added after a previous lookup."""
+        env = Environment()
+
+        env.add_sync("agent1", "task", "data", {"version": 1})
+        env.add_sync("agent1", "task", "other", {"version": 1})
+        assert env.strongest("task", "data").data["version"] == 1
+
+        env.decay("task", rates={"data": 0.5})
+        env.add_sync("agent2", "task", "data", {"version": 2})
+
+        strongest = env.strongest("task", "data")
+        assert strongest is not None
+        assert strongest.data["version"] == 2
+        assert [t.type for t in env.read("task", "other")] == ["other"]
+
+    def test_read_returns_traces_in_time_order(self):
+        """Unfiltered read() should interleave types by creation time."""
+        env = Environment()
+
+        first = env.add_sync("a", "task", "plan", {"step": 1})
+        second = env.add_sync("b", "task", "code", {"step": 2})
+        third = env.add_sync("c", "task", "plan", {"step": 3})
+        # Pin timestamps so coarse clocks cannot produce ties
+        first.time_ns, second.time_ns, third.time_ns = 1, 2, 3
+
+        assert [t.data["step"] for t in env.read("task")] == [1, 2, 3]
+
     def test_invalidate_marks_traces(self):
         """invalidate() should mark traces as invalid."""
         env = Environment()
@@ -101,19 +224,63 @@ class TestEnvironment:
         trace = env.strongest("task", "output")
         assert trace is None  # No alive traces
 
+    def test_invalidated_traces_kept_for_observe_until_decay(self):
+        """Invalidated traces leave reads at once but stay visible in observe()."""
+        env = Environment()
+
+        env.add_sync("agent1", "task", "output", {"value": 1})
+        env.add_sync("agent2", "task", "output", {"value": 2})
+        env.invalidate("task", agent="agent1")
+
+        assert [t.agent for t in env.read("task")] == ["agent2"]
+        assert env.freshest("task", "output").agent == "agent2"
+        assert "✗ [output] agent1" in env.observe("task")
+
+        env.decay("task")
+
+        assert "agent1" not in env.observe("task")
+        assert [t.agent for t in env.read("task", "output")] == ["agent2"]
+
+    def test_trace_invalidate_warns_and_points_to_environment(self):
+        """Trace.invalidate() should warn that Environment.invalidate is needed."""
+        env = Environment()
+        trace = env.add_sync("agent1", "task", "output", {"value": 1})
+
+        with pytest.warns(DeprecationWarning, match="Environment.invalidate"):
+            trace.invalidate()
+
+        assert trace.invalidated
+
     def test_decay_weakens_traces(self):
         """decay() should reduce trace strength."""
         env = Environment()
 
         env.add_sync("agent1", "task", "data", {"value": 1})
-        initial_strength = env._traces["task"][0].strength
+        initial_strength = env._traces["task"]["data"][0].strength
 
         env.decay("task", rates={"data": 0.5})
 
-        final_strength = env._traces["task"][0].strength
+        final_strength = env._traces["task"]["data"][0].strength
         assert final_strength < initial_strength
         assert final_strength == pytest.approx(0.5)
 
+    def test_summary_counts_alive_traces(self):
+        """summary() should only count traces that are still alive."""
+        env = Environment()
+
+        env.add_sync("planner", "task", "plan", {"value": 1})
+        env.add_sync("coder", "task", "code", {"value": 1})
+        env.add_sync("coder", "task", "code", {"value": 2})
+        env.add_sync("scratch", "task", "note", {"value": 1})
+
+        env.invalidate("task", type="plan")
+        env.decay("task", rates={"note": 0.99})
+
+        summary = env.summary("task")
+        assert summary["types"] == {"code": 2}
+        assert summary["agents"] == ["coder"]
+        assert summary["total"] == 2
+
     def test_observe_returns_debug_string(self):
         """observe() should return readable debug output."""
         env = Environment()
@@ -124,3 +291,142 @@ class TestEnvironment:
         assert "analyzer" in output
         assert "analysis" in output
         assert "str=" in output
+
+
+class TestAgent:
+    """Test agent activation rules."""
+
+    def test_can_activate_follows_environment_changes(self):
+        """Cached activation should be refreshed when traces change."""
+
+        @agent("coder", consumes=["plan"], produces="code")
+        async def code(ctx):
+            return {"code": "..."}
+
+        env = Environment()
+        assert not code.can_activate(env, "task")
+
+        env.add_sync("planner", "task", "plan", {"plan": "..."})
+        assert code.can_activate(env, "task")
+
+        env.add_sync("coder", "task", "code", {"code": "..."})
+        assert not code.can_activate(env, "task")
+
+        env.invalidate("task", type="code")
+        assert code.can_activate(env, "task")
+
+    @pytest.mark.asyncio
+    async def test_pure_agent_reuse_returns_independent_copies(self):
+        """Mutating a reused result should not affect later reuses."""
+        calls = []
+
+        @agent("generator", consumes=["goal"], produces="output", pure=True)
+        async def generate(ctx):
+            calls.append(ctx)
+            return {"text": "done"}
+
+        env = Environment()
+        env.add_sync("user", "task", "goal", {"goal": "..."})
+        memo = {}
+
+        first = await generate.act(env, "task", memo)
+        first["text"] = "mutated"
+        second = await generate.act(env, "task", memo)
+        second["text"] = "mutated again"
+        third = await generate.act(env, "task", memo)
+
+        assert len(calls) == 1
+        assert third == {"text": "done"}
+
+    @pytest.mark.asyncio
+    async def test_pure_agent_runs_when_memo_cannot_be_used(self):
+        """Unserializable contexts and uncopyable results skip the memo."""
+        calls = []
+        lock = threading.Lock()
+
+        @agent("client", consumes=["config"], produces="session", pure=True)
+        async def connect(ctx):
+            calls.append(ctx)
+            return {"lock": lock}
+
+        env = Environment()
+        memo = {}
+
+        env.add_sync("user", "mixed", "config", {1: "a", "b": 2})
+        assert await connect.act(env, "mixed", memo) == {"lock": lock}
+        assert await connect.act(env, "mixed", memo) == {"lock": lock}
+
+        env.add_sync("user", "plain", "config", {"b": 2})
+        result = await connect.act(env, "plain", memo)
+        assert result["lock"] is lock
+        await connect.act(env, "plain", memo)
+
+        assert len(calls) == 4
+        assert memo == {}
+
+    def test_can_activate_cached_across_decay_without_pruning(self):
+        """Decay that removes no traces should not force a re-check."""
+
+        @agent("coder", consumes=["plan"], produces="code")
+        async def code(ctx):
+            return {"code": "..."}
+
+        checks = []
+        check_traces = code._check_traces
+
+        def counting_check(env, task):
+            checks.append(task)
+            return check_traces(env, task)
+
+        code._check_traces = counting_check
+
+        env = Environment()
+        env.add_sync("planner", "task", "plan", {"plan": "..."})
+        assert code.can_activate(env, "task")
+
+        env.decay("task")
+        assert code.can_activate(env, "task")
+        assert len(checks) == 1
+
+        env.decay("task", rates={"plan": 0.99})
+        assert not code.can_activate(env, "task")
+        assert len(checks) == 2
+
+    @pytest.mark.asyncio
+    async def test_wrap_result_wraps_non_dict_results(self):
+        """wrap_result=True should store non-dict results under "result"."""
+
+        @agent("counter", consumes=["goal"], produces="count", wrap_result=True)
+        async def count(ctx):
+            return 3
+
+        env = Environment()
+        env.add_sync("user", "task", "goal", {"goal": "..."})
+
+        assert await count.act(env, "task") == {"result": 3}
+        assert env.strongest_data("task", "count") == {"result": 3}
+
+
+class TestScheduling:
+    """Test readiness-based scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_invalidated_output_is_recomputed(self):
+        """Invalidating an output should re-activate its producer on next run."""
+        calls = []
+
+        @agent("generator", consumes=["goal"], produces="output")
+        async def generate(ctx):
+            calls.append("generator")
+            return {"attempt": len(calls)}
+
+        collective = Collective().add(generate)
+        await collective.run(task="retry", goal="Test")
+        assert calls == ["generator"]
+
+        collective.env.invalidate("retry", type="output")
+        result = await collective.run(task="retry", goal="Test")
+
+        assert result.converged
+        assert calls == ["generator", "generator"]
+        assert collective.result("retry", "output") == {"attempt": 2}